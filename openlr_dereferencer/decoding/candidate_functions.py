@@ -1,8 +1,9 @@
 "Contains functions for candidate searching and map matching"
 
+from heapq import heapify, heappop
 from itertools import product
 from logging import debug
-from typing import Optional, Iterable, List, Tuple
+from typing import Optional, Iterable, Iterator, List, Sequence, Tuple, Dict
 from openlr import FRC, LocationReferencePoint
 from ..maps import shortest_path, MapReader, Line
 from ..maps.a_star import LRPathNotFoundError
@@ -59,17 +60,39 @@ def make_candidates(
         debug(f"Not considering {candidate} because the bearing difference is {bear_diff} °.",
               f"bear: {bearing}. lrp bear: {lrp.bear}")
         return
-    candidate.score = score_lrp_candidate(lrp, candidate, config, is_last_lrp)
+    candidate.score = score_lrp_candidate(lrp, candidate, config, is_last_lrp, bearing)
     if candidate.score >= config.min_score:
         yield candidate
 
 
+def candidate_search_radius(lrp: LocationReferencePoint, config: Config) -> float:
+    """Returns the radius around the LRP in which candidates may reach `config.min_score`
+
+    Only the geolocation score depends on the distance to the LRP. A line farther away
+    than this radius scores below `min_score`, even if FOW, FRC and bearing fit perfectly.
+    The result is never greater than `config.search_radius`."""
+    if config.geo_weight <= 0.0:
+        return config.search_radius
+    best_other_scores = (
+        config.fow_weight * max(config.fow_standin_score[lrp.fow])
+        + config.frc_weight
+        + config.bear_weight
+    )
+    needed_geo_score = (config.min_score - best_other_scores) / config.geo_weight
+    if needed_geo_score <= 0.0:
+        return config.search_radius
+    # Leave some margin, because a map reader may measure the distance slightly differently
+    radius = 1.01 * config.search_radius * (1.0 - needed_geo_score)
+    return min(max(radius, 0.0), config.search_radius)
+
+
 def nominate_candidates(
         lrp: LocationReferencePoint, reader: MapReader, config: Config, is_last_lrp: bool
 ) -> Iterable[Candidate]:
     "Yields candidate lines for the LRP along with their score."
-    debug(f"Finding candidates for LRP {lrp} at {coords(lrp)} in radius {config.search_radius}")
-    for line in reader.find_lines_close_to(coords(lrp), config.search_radius):
+    radius = candidate_search_radius(lrp, config)
+    debug(f"Finding candidates for LRP {lrp} at {coords(lrp)} in radius {radius}")
+    for line in reader.find_lines_close_to(coords(lrp), radius):
         yield from make_candidates(lrp, line, config, is_last_lrp)
 
 
@@ -109,13 +132,30 @@ def get_candidate_route(start: Candidate, dest: Candidate, lfrc: FRC, maxlen: fl
         return None
 
 
+def best_pairs_first(
+        candidates: Sequence[Candidate], next_candidates: Sequence[Candidate]
+) -> Iterator[Tuple[Candidate, Candidate]]:
+    """Yields all pairs of candidates for two consecutive LRPs, best sum of scores first.
+
+    The pairs are ordered lazily through a heap, as usually only the first few of them are
+    tried. Pairs with equal scores keep the order in which `product` generates them."""
+    heap = [
+        (-(c_from.score + c_to.score), index, (c_from, c_to))
+        for (index, (c_from, c_to)) in enumerate(product(candidates, next_candidates))
+    ]
+    heapify(heap)
+    while heap:
+        yield heappop(heap)[2]
+
+
 def match_tail(
         current: LocationReferencePoint,
         candidates: List[Candidate],
         tail: List[LocationReferencePoint],
         reader: MapReader,
         config: Config,
-        observer: Optional[DecoderObserver]
+        observer: DecoderObserver,
+        candidate_cache: Optional[Dict[Tuple[LocationReferencePoint, bool], List[Candidate]]] = None
 ) -> List[Route]:
     """Searches for the rest of the line location.
 
@@ -136,7 +176,12 @@ def match_tail(
         config:
             The wanted behaviour, as configuration options
         observer:
-            The optional decoder observer, which emits events and calls back.
+            The decoder observer, which emits events and calls back.
+        candidate_cache:
+            Candidates already nominated for an LRP, keyed by the LRP and whether it is the last.
+
+            When backtracking, the same LRPs are visited several times. The cache is filled
+            on the first visit and passed on to recursive calls.
 
     Returns:
         If any candidate pair matches, the function calls itself for the rest of `tail` and
@@ -154,36 +199,38 @@ def match_tail(
 
     # Generate all pairs of candidates for the first two lrps
     next_lrp = tail[0]
-    next_candidates = list(nominate_candidates(next_lrp, reader, config, last_lrp))
-
-    if observer is not None:
-        observer.on_candidates_found(next_lrp, next_candidates)
+    if candidate_cache is None:
+        candidate_cache = {}
+    if (next_lrp, last_lrp) not in candidate_cache:
+        candidate_cache[next_lrp, last_lrp] = list(
+            nominate_candidates(next_lrp, reader, config, last_lrp)
+        )
+    next_candidates = candidate_cache[next_lrp, last_lrp]
 
-    pairs = list(product(candidates, next_candidates))
-    # Sort by line scores
-    pairs.sort(key=lambda pair: (pair[0].score + pair[1].score), reverse=True)
+    observer.on_candidates_found(next_lrp, next_candidates)
 
     # For every pair of candidates, search for a path matching our requirements
-    for (c_from, c_to) in pairs:
+    for (c_from, c_to) in best_pairs_first(candidates, next_candidates):
         route = handleCandidatePair((current, next_lrp), (c_from, c_to), observer, lfrc, minlen, maxlen)
         if route is None:
             continue
         if last_lrp:
             return [route]
         try:
-            return [route] + match_tail(next_lrp, [c_to], tail[1:], reader, config, observer)
+            return [route] + match_tail(
+                next_lrp, [c_to], tail[1:], reader, config, observer, candidate_cache
+            )
         except LRDecodeError:
             debug("Recursive call to resolve remaining path had no success")
             continue
 
-    if observer is not None:
-        observer.on_matching_fail(current, next_lrp, candidates, next_candidates)
+    observer.on_matching_fail(current, next_lrp, candidates, next_candidates)
     raise LRDecodeError("Decoding was unsuccessful: No candidates left or available.")
 
 def handleCandidatePair(
         lrps: Tuple[LocationReferencePoint, LocationReferencePoint],
         candidates: Tuple[Candidate, Candidate],
-        observer: Optional[DecoderObserver],
+        observer: DecoderObserver,
         lowest_frc: FRC,
         minlen: float,
         maxlen: float,
@@ -197,7 +244,7 @@ def handleCandidatePair(
         candidates:
             The two candidates
         observer:
-            An optional decoder observer
+            The decoder observer
         lowest_frc:
             The lowest acceptable FRC for a line to be considered part of the route
         minlen:
@@ -215,14 +262,12 @@ def handleCandidatePair(
 
     if not route:
         debug("No path for candidate found")
-        if observer is not None:
-            observer.on_route_fail(current, next_lrp, source, dest)
+        observer.on_route_fail(current, next_lrp, source, dest)
         return None
 
     length = route.length()
 
-    if observer is not None:
-        observer.on_route_success(current, next_lrp, source, dest, route)
+    observer.on_route_success(current, next_lrp, source, dest, route)
 
     debug(f"DNP should be {current.dnp} m, is {length} m.")
     # If the path does not match DNP, continue with the next candidate pair
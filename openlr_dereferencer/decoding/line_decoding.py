@@ -3,7 +3,7 @@
 from typing import List, Optional
 from openlr import LineLocationReference, LocationReferencePoint
 from ..maps import MapReader
-from ..observer import DecoderObserver
+from ..observer import DecoderObserver, NULL_OBSERVER
 from .candidate_functions import nominate_candidates, match_tail
 from .line_location import build_line_location, LineLocation
 from .routes import Route
@@ -17,11 +17,12 @@ def dereference_path(
         observer: Optional[DecoderObserver]
 ) -> List[Route]:
     "Decode the location reference path, without considering any offsets"
+    if observer is None:
+        observer = NULL_OBSERVER
     first_lrp = lrps[0]
     first_candidates = list(nominate_candidates(first_lrp, reader, config, False))
 
-    if observer is not None:
-        observer.on_candidates_found(first_lrp, first_candidates)
+    observer.on_candidates_found(first_lrp, first_candidates)
 
     linelocationpath = match_tail(first_lrp, first_candidates, lrps[1:], reader, config, observer)
     return linelocationpath
@@ -41,11 +41,14 @@ class LineLocation:
 def get_lines(line_location_path: Iterable[Route]) -> List[Line]:
     "Convert a line location path to its sequence of line elements"
     result = []
+    last_id = None
     for part in line_location_path:
         for line in part.lines:
-            if result and result[-1].line_id == line.line_id:
-                result.pop()
+            # Consecutive parts share the line on which they meet
+            if result and line.line_id == last_id:
+                continue
             result.append(line)
+            last_id = line.line_id
     return result
 
 
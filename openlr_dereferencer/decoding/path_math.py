@@ -1,15 +1,12 @@
 "Functions for reckoning with paths, bearing, and offsets"
 
 from math import degrees
-from typing import List
 from logging import debug
-from shapely.geometry import LineString, Point
-from shapely.ops import substring
 from openlr import Coordinates, LocationReferencePoint
 from .error import LRDecodeError
 from .routes import Route, PointOnLine
 from ..maps import Line
-from ..maps.wgs84 import interpolate, bearing, line_string_length
+from ..maps.wgs84 import interpolate, bearing, distance, pairwise
 
 
 def remove_offsets(path: Route, p_off: float, n_off: float) -> Route:
@@ -20,28 +17,29 @@ def remove_offsets(path: Route, p_off: float, n_off: float) -> Route:
     # Remove positive offset
     debug(f"first line's offset is {path.absolute_start_offset}")
     remaining_poff = p_off + path.absolute_start_offset
-    while remaining_poff >= lines[0].length:
+    start_index = 0
+    while remaining_poff >= lines[start_index].length:
         debug(f"Remaining positive offset {remaining_poff} is greater than "
               f"the first line. Removing it.")
-        remaining_poff -= lines.pop(0).length
-        if not lines:
+        remaining_poff -= lines[start_index].length
+        start_index += 1
+        if start_index == len(lines):
             raise LRDecodeError("Offset is bigger than line location path")
     # Remove negative offset
     remaining_noff = n_off + path.absolute_end_offset
-    while remaining_noff >= lines[-1].length:
+    end_index = len(lines) - 1
+    while remaining_noff >= lines[end_index].length:
         debug(f"Remaining negative offset {remaining_noff} is greater than "
               f"the last line. Removing it.")
-        remaining_noff -= lines.pop().length
-        if not lines:
+        remaining_noff -= lines[end_index].length
+        end_index -= 1
+        if end_index < start_index:
             raise LRDecodeError("Offset is bigger than line location path")
-    start_line = lines.pop(0)
-    if lines:
-        end_line = lines.pop()
-    else:
-        end_line = start_line
+    start_line = lines[start_index]
+    end_line = lines[end_index]
     return Route(
         PointOnLine.from_abs_offset(start_line, remaining_poff),
-        lines,
+        lines[start_index + 1:end_index],
         PointOnLine.from_abs_offset(end_line, end_line.length - remaining_noff)
     )
 
@@ -55,23 +53,37 @@ def project(line: Line, coord: Coordinates) -> PointOnLine:
     """Computes the nearest point to `coord` on the line
 
     Returns: The point on `line` where this nearest point resides"""
-    fraction = line.geometry.project(Point(coord.lon, coord.lat), normalized=True)
-
-    to_projection_point = substring(line.geometry, 0.0, fraction, normalized=True)
-
-    meters_to_projection_point = line_string_length(to_projection_point)
-    geometry_length = line_string_length(line.geometry)
-
-    length_fraction = meters_to_projection_point / geometry_length
+    lengths = line.cumulative_lengths()
+    # Find the nearest point in the planar lon/lat metric, like shapely's `project` would
+    best_sqdist = None
+    best_index = 0
+    best_point = None
+    for (index, (point_a, point_b)) in enumerate(pairwise(line.geometry.coords)):
+        seg_lon = point_b[0] - point_a[0]
+        seg_lat = point_b[1] - point_a[1]
+        seg_sqlen = seg_lon * seg_lon + seg_lat * seg_lat
+        fraction = 0.0
+        if seg_sqlen > 0.0:
+            fraction = ((coord.lon - point_a[0]) * seg_lon
+                        + (coord.lat - point_a[1]) * seg_lat) / seg_sqlen
+            fraction = min(max(fraction, 0.0), 1.0)
+        foot_lon = point_a[0] + fraction * seg_lon
+        foot_lat = point_a[1] + fraction * seg_lat
+        sqdist = (foot_lon - coord.lon) ** 2 + (foot_lat - coord.lat) ** 2
+        if best_sqdist is None or sqdist < best_sqdist:
+            best_sqdist = sqdist
+            best_index = index
+            best_point = (point_a, Coordinates(foot_lon, foot_lat))
+
+    point_a, projection_point = best_point
+    meters_to_projection_point = (
+        lengths[best_index] + distance(Coordinates(*point_a), projection_point)
+    )
+    length_fraction = meters_to_projection_point / lengths[-1]
 
     return PointOnLine(line, length_fraction)
 
 
-def linestring_coords(line: LineString) -> List[Coordinates]:
-    "Returns the edges of the line geometry as Coordinate list"
-    return [Coordinates(*point) for point in line.coords]
-
-
 def compute_bearing(
         lrp: LocationReferencePoint,
         candidate: PointOnLine,
@@ -79,16 +91,21 @@ def compute_bearing(
         bear_dist: float
 ) -> float:
     "Returns the bearing angle of a partial line in degrees in the range 0.0 .. 360.0"
-    line1, line2 = candidate.split()
+    first_part, second_part = candidate.split_coordinates()
     if is_last_lrp:
-        if line1 is None:
+        if first_part is None:
             return 0.0
-        coordinates = linestring_coords(line1)
+        coordinates = first_part
         coordinates.reverse()
     else:
-        if line2 is None:
+        if second_part is None:
             return 0.0
-        coordinates = linestring_coords(line2)
-    bearing_point = interpolate(coordinates, bear_dist)
+        coordinates = second_part
+    if len(coordinates) == 2 and bear_dist > 0.0:
+        # Whether the bearing point is on the single segment or clamped to its end,
+        # it lies in the direction of the segment end
+        bearing_point = coordinates[1]
+    else:
+        bearing_point = interpolate(coordinates, bear_dist)
     bear = bearing(coordinates[0], bearing_point)
     return degrees(bear) % 360
@@ -1,11 +1,12 @@
 "Defines data types out of which line locations consist"
 
+from bisect import bisect_right
 from typing import NamedTuple, Tuple, Optional, List
 from shapely.geometry import LineString
 from shapely.ops import substring
 from openlr import Coordinates
 from ..maps.abstract import Line, path_length
-from ..maps.wgs84 import interpolate, split_line, join_lines, line_string_length
+from ..maps.wgs84 import interpolate, join_coordinates
 
 
 class PointOnLine(NamedTuple):
@@ -18,7 +19,7 @@ class PointOnLine(NamedTuple):
     relative_offset: float
 
     def _geometry_length_from_start(self):
-        geometry_length = line_string_length(self.line.geometry)
+        geometry_length = self.line.cumulative_lengths()[-1]
         return geometry_length * self.relative_offset
 
     def position(self) -> Coordinates:
@@ -33,9 +34,33 @@ class PointOnLine(NamedTuple):
         "Returns the distance in meters from the point to the end of the line"
         return (1.0 - self.relative_offset) * self.line.length
 
+    def split_coordinates(self) -> Tuple[Optional[List[Coordinates]], Optional[List[Coordinates]]]:
+        """Splits the shape of the Line element at this point and returns the coordinates of the parts
+
+        A part is None if it would be a single point."""
+        points = self.line.geometry.coords
+        lengths = self.line.cumulative_lengths()
+        meters_into = self._geometry_length_from_start()
+        # The index of the segment which contains the point
+        index = bisect_right(lengths, meters_into) - 1
+        if index >= len(points) - 1:
+            return ([Coordinates(*point) for point in points], None)
+        segment_start = Coordinates(*points[index])
+        segment_end = Coordinates(*points[index + 1])
+        splitpoint = interpolate([segment_start, segment_end], meters_into - lengths[index])
+        first_part = [Coordinates(*point) for point in points[:index + 1]]
+        if splitpoint != segment_start:
+            first_part.append(splitpoint)
+        second_part = [splitpoint] + [Coordinates(*point) for point in points[index + 1:]]
+        return (first_part if len(first_part) > 1 else None, second_part)
+
     def split(self) -> Tuple[Optional[LineString], Optional[LineString]]:
         "Splits the Line element that this point is along and returns the parts"
-        return split_line(self.line.geometry, self._geometry_length_from_start())
+        (first_part, second_part) = self.split_coordinates()
+        return (
+            LineString(first_part) if first_part is not None else None,
+            LineString(second_part) if second_part is not None else None
+        )
 
     @classmethod
     def from_abs_offset(cls, line: Line, meters_into: float):
@@ -102,15 +127,15 @@ class Route(NamedTuple):
             )
 
         result = []
-        first = self.start.split()[1]
-        last = self.end.split()[0]
+        first = self.start.split_coordinates()[1]
+        last = self.end.split_coordinates()[0]
         if first is not None:
             result.append(first)
-        result += [line.geometry for line in self.path_inbetween]
+        result += [line.geometry.coords for line in self.path_inbetween]
         if last is not None:
             result.append(last)
 
-        return join_lines(result)
+        return join_coordinates(result)
 
     def coordinates(self) -> List[Coordinates]:
         "Returns all Coordinates of this line location"
@@ -6,15 +6,22 @@ The result of the scoring functions will be floats from 0.0 to 1.0,
 with `1.0` being an exact match and 0.0 being a non-match."""
 
 from logging import debug
+from typing import Optional
 from openlr import FRC, FOW, LocationReferencePoint
 from ..maps.wgs84 import distance
 from .path_math import coords, PointOnLine, compute_bearing
 from .configuration import Config
 
 
+#: The FRC score of every FRC combination, looked up by `FRC_SCORES[wanted][actual]`
+FRC_SCORES = tuple(
+    tuple(1.0 - abs(actual - wanted) / 7 for actual in FRC) for wanted in FRC
+)
+
+
 def score_frc(wanted: FRC, actual: FRC) -> float:
     "Return a score for a FRC value"
-    return 1.0 - abs(actual - wanted) / 7
+    return FRC_SCORES[wanted][actual]
 
 
 def score_geolocation(wanted: LocationReferencePoint, actual: PointOnLine, radius: float) -> float:
@@ -94,8 +101,8 @@ def score_angle_difference(angle1: float, angle2: float) -> float:
     Returns:
         The similarity of angle1 and angle2, from 0.0 (180° difference) to 1.0 (0° difference)
     """
-    difference = angle_difference(angle1, angle2)
-    return 1 - abs(difference) / 180
+    # Distance of the wrapped difference from the opposite direction
+    return abs((angle1 - angle2) % 360 - 180) / 180
 
 
 def score_bearing(
@@ -113,16 +120,23 @@ def score_bearing(
 
 def score_lrp_candidate(
         wanted: LocationReferencePoint,
-        candidate: PointOnLine, config: Config, is_last_lrp: bool
+        candidate: PointOnLine, config: Config, is_last_lrp: bool,
+        bearing: Optional[float] = None
 ) -> float:
     """Scores the candidate (line) for the LRP.
 
-    This is the average of fow, frc, geo and bearing score."""
+    This is the average of fow, frc, geo and bearing score.
+
+    If the candidate's bearing was already computed, pass it as `bearing` (in degrees),
+    so that it is not computed a second time."""
     debug(f"scoring {candidate} with config {config}")
     geo_score = config.geo_weight * score_geolocation(wanted, candidate, config.search_radius)
     fow_score = config.fow_weight * config.fow_standin_score[wanted.fow][candidate.line.fow]
     frc_score = config.frc_weight * score_frc(wanted.frc, candidate.line.frc)
-    bear_score = score_bearing(wanted, candidate, is_last_lrp, config.bear_dist)
+    if bearing is None:
+        bear_score = score_bearing(wanted, candidate, is_last_lrp, config.bear_dist)
+    else:
+        bear_score = score_angle_sector_differences(wanted.bear, bearing)
     bear_score *= config.bear_weight
     score = fow_score + frc_score + geo_score + bear_score
     debug(f"Score: geo {geo_score} + fow {fow_score} + frc {frc_score} "
@@ -3,12 +3,37 @@ the interface in openlr_dereferencer.maps"""
 
 import os
 import sqlite3
-from typing import Sequence, Tuple, Iterable
+from math import cos, radians
+from typing import Sequence, Tuple, Iterable, Dict, Optional
 from openlr import Coordinates
-from .primitives import Line, Node, ExampleMapError, SRID
+from .primitives import Line, Node, ExampleMapError, SRID, LINE_ROW_COLUMNS
 from ..maps import MapReader, wgs84
 
 
+def bounding_box(coord: Coordinates, dist: float) -> Optional[Tuple[float, float, float, float]]:
+    """Returns a lon/lat box containing everything within `dist` meters around `coord`
+
+    The box is given as `(min_lon, max_lon, min_lat, max_lat)`. It may be slightly
+    larger than necessary, but never too small.
+
+    Returns None if the area reaches across the antimeridian or a pole, because it
+    can not be described by a single longitude range then."""
+    # One degree of latitude is at least 110.5 km long, one degree of longitude
+    # at least 111.3 km times the cosine of the latitude
+    lat_delta = dist / 110_000
+    max_abs_lat = abs(coord.lat) + lat_delta
+    if max_abs_lat >= 90.0:
+        lon_delta = 360.0
+    else:
+        lon_delta = dist / (111_000 * cos(radians(max_abs_lat)))
+    if coord.lon - lon_delta < -180.0 or coord.lon + lon_delta > 180.0:
+        return None
+    return (
+        coord.lon - lon_delta, coord.lon + lon_delta,
+        coord.lat - lat_delta, coord.lat + lat_delta
+    )
+
+
 class ExampleMapReader(MapReader):
     """
     This is a reader for the example map format described in `map_format.md`.
@@ -26,32 +51,68 @@ class ExampleMapReader(MapReader):
                 "Spatialite (the mod_spatialite library) was not found on your system."
                 "Please install all dependencies."
             )
+        self._line_cache: Dict[int, Line] = {}
+        self._node_cache: Dict[int, Node] = {}
+        self._nodes_indexed = self._has_spatial_index("nodes", "coord")
+        self._lines_indexed = self._has_spatial_index("lines", "path")
+
+    def _has_spatial_index(self, table: str, column: str) -> bool:
+        "Checks if SpatiaLite maintains an R*Tree index on the geometry column"
+        stmt = """SELECT spatial_index_enabled FROM geometry_columns
+            WHERE f_table_name = ? AND f_geometry_column = ?"""
+        row = self.connection.execute(stmt, (table, column)).fetchone()
+        return row is not None and row[0] == 1
+
+    def _cached_line(self, line_id: int) -> Line:
+        "Returns the line object for an existing line ID, reusing it if it was created before"
+        line = self._line_cache.get(line_id)
+        if line is None:
+            line = self._line_cache[line_id] = Line(self, line_id)
+        return line
+
+    def _cached_node(self, node_id: int) -> Node:
+        "Returns the node object for an existing node ID, reusing it if it was created before"
+        node = self._node_cache.get(node_id)
+        if node is None:
+            node = self._node_cache[node_id] = Node(self, node_id)
+        return node
+
+    def clear_cache(self):
+        """Forgets all line and node objects created so far.
+
+        Call this if the underlying DB was modified after reading from it."""
+        self._line_cache.clear()
+        self._node_cache.clear()
 
     def get_line(self, line_id: int) -> Line:
+        if line_id in self._line_cache:
+            return self._line_cache[line_id]
         # Just verify that this line ID exists.
         result = self.connection.execute("SELECT rowid FROM lines WHERE rowid=?", (line_id,))
         if result.fetchone() is None:
             raise ExampleMapError(f"The line {line_id} does not exist")
-        return Line(self, line_id)
+        return self._cached_line(line_id)
 
     def get_lines(self) -> Iterable[Line]:
         result = self.connection.execute("SELECT rowid FROM lines")
         for (line_id,) in result:
-            yield Line(self, line_id)
+            yield self._cached_line(line_id)
 
     def get_linecount(self) -> int:
         (count,) = self.connection.execute("SELECT COUNT(*) FROM lines").fetchone()
         return count
 
     def get_node(self, node_id: int) -> Node:
+        if node_id in self._node_cache:
+            return self._node_cache[node_id]
         result = self.connection.execute("SELECT id FROM nodes WHERE id=?", (node_id,))
         (node_id,) = result.fetchone()
-        return Node(self, node_id)
+        return self._cached_node(node_id)
 
     def get_nodes(self) -> Iterable[Node]:
         result = self.connection.execute("SELECT id FROM nodes")
         for (node_id,) in result.fetchall():
-            yield Node(self, node_id)
+            yield self._cached_node(node_id)
 
     def get_nodecount(self) -> int:
         (count,) = self.connection.execute("SELECT COUNT(*) FROM nodes").fetchone()
@@ -63,12 +124,29 @@ class ExampleMapReader(MapReader):
         Yields every node within this distance to `coord`."""
         lon, lat = coord.lon, coord.lat
         stmt = """SELECT id FROM nodes WHERE Distance(MakePoint(?, ?), coord, 0) < ?"""
-        for (node_id,) in self.connection.execute(stmt, (lon, lat, dist)):
-            yield Node(self, node_id)
+        params = (lon, lat, dist)
+        box = bounding_box(coord, dist)
+        if self._nodes_indexed and box is not None:
+            stmt += """ AND id IN (SELECT pkid FROM idx_nodes_coord
+                WHERE xmax >= ? AND xmin <= ? AND ymax >= ? AND ymin <= ?)"""
+            params += box
+        for (node_id,) in self.connection.execute(stmt, params):
+            yield self._cached_node(node_id)
 
     def find_lines_close_to(self, coord: Coordinates, dist: float) -> Iterable[Line]:
-        "Yields all lines within `dist` meters around `coord`"
+        """Yields all lines within `dist` meters around `coord`
+
+        The attributes of all found lines are read along with them, in the same query."""
         lon, lat = coord.lon, coord.lat
-        stmt = """SELECT rowid FROM lines WHERE PtDistWithin(MakePoint(?, ?), path, ?, 0)"""
-        for (line_id,) in self.connection.execute(stmt, (lon, lat, dist)):
-            yield Line(self, line_id)
+        stmt = f"""SELECT rowid, {LINE_ROW_COLUMNS} FROM lines
+            WHERE PtDistWithin(MakePoint(?, ?), path, ?, 0)"""
+        params = (lon, lat, dist)
+        box = bounding_box(coord, dist)
+        if self._lines_indexed and box is not None:
+            stmt += """ AND rowid IN (SELECT pkid FROM idx_lines_path
+                WHERE xmax >= ? AND xmin <= ? AND ymax >= ? AND ymin <= ?)"""
+            params += box
+        for (line_id, *row) in self.connection.execute(stmt, params).fetchall():
+            line = self._cached_line(line_id)
+            line._preload(row)
+            yield line
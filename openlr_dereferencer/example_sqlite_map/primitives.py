@@ -1,15 +1,37 @@
 "Contains the Node and the Line class of the example format"
 
 from itertools import chain
-from typing import Iterable
+from typing import Iterable, NamedTuple, List
 from openlr import Coordinates, FRC, FOW
 from shapely.geometry import LineString
+from shapely.wkb import loads as wkb_loads
 from ..maps import Line as AbstractLine, Node as AbstractNode
+from ..maps.wgs84 import cumulative_lengths
 
 # https://epsg.io/4326
 SRID = 4326
 
 
+class LineRow(NamedTuple):
+    "The attributes of a line, as read from the DB in one go"
+    startnode: int
+    endnode: int
+    frc: FRC
+    fow: FOW
+    length: float
+    geometry: LineString
+
+    @classmethod
+    def from_db_row(cls, row: tuple) -> "LineRow":
+        "Builds the line attributes from a DB row selecting `LINE_ROW_COLUMNS`"
+        (startnode, endnode, frc, fow, length, path) = row
+        return cls(startnode, endnode, FRC(frc), FOW(fow), length, wkb_loads(path))
+
+
+#: The columns of the `lines` table that make up a `LineRow`, for use in SELECT statements
+LINE_ROW_COLUMNS = f"startnode, endnode, frc, fow, GLength(path, {SRID}), AsBinary(path)"
+
+
 class Line(AbstractLine):
     "Line object implementation for the example format"
 
@@ -18,10 +40,25 @@ class Line(AbstractLine):
             raise ExampleMapError(f"Line id '{line_id}' has confusing type {type(line_id)}")
         self.map_reader = map_reader
         self.line_id_internal = line_id
+        self._row = None
+        self._cumulative_lengths = None
 
     def __repr__(self):
         return f"Line with id={self.line_id} of length {self.length}"
 
+    def _load(self) -> LineRow:
+        "Fetches all attributes of this line with a single query and caches them"
+        if self._row is None:
+            stmt = f"SELECT {LINE_ROW_COLUMNS} FROM lines WHERE rowid = ?"
+            row = self.map_reader.connection.execute(stmt, (self.line_id,)).fetchone()
+            self._row = LineRow.from_db_row(row)
+        return self._row
+
+    def _preload(self, row: tuple):
+        "Caches the attributes from a row that was fetched along with other lines"
+        if self._row is None:
+            self._row = LineRow.from_db_row(row)
+
     @property
     def line_id(self) -> int:
         "Returns the line id"
@@ -30,41 +67,31 @@ class Line(AbstractLine):
     @property
     def start_node(self) -> "Node":
         "Returns the node from which this line comes from"
-        stmt = "SELECT startnode FROM lines WHERE rowid = ?"
-        (point_id,) = self.map_reader.connection.execute(stmt, (self.line_id,)).fetchone()
-        return self.map_reader.get_node(point_id)
+        return self.map_reader._cached_node(self._load().startnode)
 
     @property
     def end_node(self) -> "Node":
         "Returns the node to which this line goes"
-        stmt = "SELECT endnode FROM lines WHERE rowid = ?"
-        (point_id,) = self.map_reader.connection.execute(stmt, (self.line_id,)).fetchone()
-        return self.map_reader.get_node(point_id)
+        return self.map_reader._cached_node(self._load().endnode)
 
     @property
     def fow(self) -> FOW:
         "Returns the form of way for this line"
-        stmt = "SELECT fow FROM lines WHERE rowid = ?"
-        (fow,) = self.map_reader.connection.execute(stmt, (self.line_id,)).fetchone()
-        return FOW(fow)
+        return self._load().fow
 
     @property
     def frc(self) -> FRC:
         "Returns the functional road class for this line"
-        stmt = "SELECT frc FROM lines WHERE rowid = ?"
-        (frc,) = self.map_reader.connection.execute(stmt, (self.line_id,)).fetchone()
-        return FRC(frc)
+        return self._load().frc
 
     @property
     def geometry(self) -> LineString:
         "Returns the line geometry"
-        points = [self.point_n(index + 1) for index in range(self.num_points())]
-        return LineString(points)
+        return self._load().geometry
 
     def distance_to(self, coord) -> float:
         "Returns the distance of this line to `coord` in meters"
-        stmt = """SELECT Distance(Makepoint(?, ?), lines.path, 1)
-            FROM nodes, lines WHERE lines.rowid = ?"""
+        stmt = "SELECT Distance(Makepoint(?, ?), path, 1) FROM lines WHERE rowid = ?"
         con = self.map_reader.connection
         (dist,) = con.execute(stmt, (coord.lon, coord.lat, self.line_id)).fetchone()
         # Details about a bug in mod_spatialite:
@@ -75,33 +102,32 @@ class Line(AbstractLine):
 
     def num_points(self) -> int:
         "Returns how many points the path geometry contains"
-        stmt = "SELECT NumPoints(path) FROM lines WHERE lines.rowid = ?"
-        (count,) = self.map_reader.connection.execute(stmt, (self.line_id,)).fetchone()
-        return count
+        return len(self.geometry.coords)
 
     def point_n(self, index) -> Coordinates:
-        "Returns the `n` th point in the path geometry, starting at 0"
-        stmt = "SELECT X(PointN(path, ?)), Y(PointN(path, ?)) FROM lines WHERE lines.rowid = ?"
-        (lon, lat) = self.map_reader.connection.execute(
-            stmt, (index, index, self.line_id)
-        ).fetchone()
-        if lon is None or lat is None:
+        "Returns the `n` th point in the path geometry, starting at 1"
+        points = self.geometry.coords
+        if not 1 <= index <= len(points):
             raise Exception(f"line {self.line_id} has no point {index}!")
-        return Coordinates(lon, lat)
+        return Coordinates(*points[index - 1])
 
     def near_nodes(self, distance):
         "Yields every point within a certain distance, in meters."
         stmt = """SELECT id FROM nodes,
         lines WHERE lines.rowid = ? AND Distance(nodes.coord, lines.path) <= ?"""
         for (point_id,) in self.map_reader.connection.execute(stmt, (self.line_id, distance)):
-            yield self.map_reader.get_node(point_id)
+            yield self.map_reader._cached_node(point_id)
 
     @property
     def length(self) -> float:
         "Length of line in meters"
-        stmt = f"SELECT GLength(path, {SRID}) FROM lines WHERE rowid = ?"
-        (result,) = self.map_reader.connection.execute(stmt, (self.line_id,)).fetchone()
-        return result
+        return self._load().length
+
+    def cumulative_lengths(self) -> List[float]:
+        "Returns the running length in meters at each point of the geometry"
+        if self._cumulative_lengths is None:
+            self._cumulative_lengths = cumulative_lengths(self.geometry.coords)
+        return self._cumulative_lengths
 
 
 class Node(AbstractNode):
@@ -112,6 +138,7 @@ class Node(AbstractNode):
             raise ExampleMapError(f"Node id '{id}' has confusing type {type(node_id)}")
         self.map_reader = map_reader
         self.node_id_internal = node_id
+        self._coordinates = None
 
     @property
     def node_id(self):
@@ -119,19 +146,21 @@ class Node(AbstractNode):
 
     @property
     def coordinates(self) -> Coordinates:
-        stmt = "SELECT X(coord), Y(coord) FROM nodes WHERE id = ?"
-        geo = self.map_reader.connection.execute(stmt, (self.node_id,)).fetchone()
-        return Coordinates(lon=geo[0], lat=geo[1])
+        if self._coordinates is None:
+            stmt = "SELECT X(coord), Y(coord) FROM nodes WHERE id = ?"
+            geo = self.map_reader.connection.execute(stmt, (self.node_id,)).fetchone()
+            self._coordinates = Coordinates(lon=geo[0], lat=geo[1])
+        return self._coordinates
 
     def outgoing_lines(self) -> Iterable[Line]:
         stmt = "SELECT rowid FROM lines WHERE startnode = ?"
         for (line_id,) in self.map_reader.connection.execute(stmt, (self.node_id,)):
-            yield Line(self.map_reader, line_id)
+            yield self.map_reader._cached_line(line_id)
 
     def incoming_lines(self) -> Iterable[Line]:
         stmt = "SELECT rowid FROM lines WHERE endnode = ?"
         for (line_id,) in self.map_reader.connection.execute(stmt, [self.node_id]):
-            yield Line(self.map_reader, line_id)
+            yield self.map_reader._cached_line(line_id)
 
     def connected_lines(self) -> Iterable[Line]:
         return chain(self.incoming_lines(), self.outgoing_lines())
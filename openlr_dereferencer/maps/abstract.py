@@ -49,6 +49,7 @@ from typing import Iterable, Hashable, Sequence
 from openlr import Coordinates, FOW, FRC
 from shapely.geometry import LineString, Point
 from shapely.geometry.base import BaseGeometry
+from .wgs84 import cumulative_lengths
 
 
 class GeometricObject(ABC):
@@ -96,6 +97,13 @@ class Line(GeometricObject):
         """Returns the shape of the line as list of Coordinates"""
         return [Coordinates(*point) for point in self.geometry.coords]
 
+    def cumulative_lengths(self) -> Sequence[float]:
+        """Returns the running length of the geometry in meters at each of its points.
+
+        The decoder uses this for locating points along the line. Implementations
+        may want to override it in order to compute it only once per line."""
+        return cumulative_lengths(self.geometry.coords)
+
     @property
     def length(self) -> float:
         "Return the line length in meters"
@@ -1,6 +1,6 @@
 "Some geo coordinates related tools"
 from math import radians, degrees
-from typing import Sequence, Tuple, Optional
+from typing import Sequence, Tuple, Optional, Iterable, List
 from geographiclib.geodesic import Geodesic
 from openlr import Coordinates
 from shapely.geometry import LineString
@@ -25,17 +25,24 @@ def pairwise(iterable):
     return zip(first, second)
 
 
-def line_string_length(line_string: LineString) -> float:
-    """Returns the length of a line string in meters"""
+def cumulative_lengths(points: Iterable[Tuple[float, float]]) -> List[float]:
+    """Returns the running length in meters at each of the (lon, lat) `points`
+
+    The first value is 0.0 and the last value is the length of the whole path."""
     geod = Geodesic.WGS84
 
-    length = 0
+    result = [0.0]
 
-    for (coord_a, coord_b) in pairwise(line_string.coords):
+    for (coord_a, coord_b) in pairwise(points):
         l = geod.Inverse(coord_a[1], coord_a[0], coord_b[1], coord_b[0], Geodesic.DISTANCE)
-        length += l["s12"]
+        result.append(result[-1] + l["s12"])
+
+    return result
+
 
-    return length
+def line_string_length(line_string: LineString) -> float:
+    """Returns the length of a line string in meters"""
+    return cumulative_lengths(line_string.coords)[-1]
 
 
 def bearing(point_a: Coordinates, point_b: Coordinates) -> float:
@@ -63,17 +70,20 @@ def interpolate(path: Sequence[Coordinates], distance_meters: float) -> Coordina
     """Go `distance` meters along the `path` and return the resulting point
 
     When the length of the path is too short, returns its last coordinate"""
+    geod = Geodesic.WGS84
     remaining_distance = distance_meters
-    segments = [(path[i], path[i + 1]) for i in range(len(path) - 1)]
-    for (point1, point2) in segments:
-        segment_length = distance(point1, point2)
+    for (point1, point2) in pairwise(path):
         if remaining_distance == 0.0:
             return point1
-        if remaining_distance < segment_length:
-            angle = bearing(point1, point2)
-            return extrapolate(point1, remaining_distance, angle)
-        remaining_distance -= segment_length
-    return segments[-1][1]
+        # Distance and azimuth of the segment are available from one inverse computation
+        segment = geod.Inverse(
+            point1.lat, point1.lon, point2.lat, point2.lon, Geodesic.DISTANCE | Geodesic.AZIMUTH
+        )
+        if remaining_distance < segment["s12"]:
+            line = geod.Direct(point1.lat, point1.lon, segment["azi1"], remaining_distance)
+            return Coordinates(line["lon2"], line["lat2"])
+        remaining_distance -= segment["s12"]
+    return path[-1]
 
 def split_line(line: LineString, meters_into: float) -> Tuple[Optional[LineString], Optional[LineString]]:
     "Splits a line at `meters_into` meters and returns the two parts. A part is None if it would be a Point"
@@ -102,11 +112,15 @@ def split_line(line: LineString, meters_into: float) -> Tuple[Optional[LineStrin
 
 
 def join_lines(lines: Sequence[LineString]) -> LineString:
+    return join_coordinates([l.coords for l in lines])
+
+
+def join_coordinates(parts: Sequence[Sequence[Tuple[float, float]]]) -> LineString:
+    "Joins connected (lon, lat) point sequences into a single line string"
     coords = []
     last = None
 
-    for l in lines:
-        cs = l.coords
+    for cs in parts:
         first = cs[0]
 
         if last is None:
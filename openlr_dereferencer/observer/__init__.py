@@ -4,3 +4,4 @@ Decoder observer package.
 
 from .simple_observer import SimpleObserver
 from .abstract import DecoderObserver
+from .null_observer import NullObserver, NULL_OBSERVER
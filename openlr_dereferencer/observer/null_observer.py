@@ -0,0 +1,32 @@
+"Contains a DecoderObserver implementation that ignores all events"
+from typing import Sequence
+from openlr import LocationReferencePoint
+from ..decoding.candidate import Candidate
+from .abstract import DecoderObserver
+from ..maps import Line
+
+
+class NullObserver(DecoderObserver):
+    """An observer that does nothing.
+
+    The decoder uses it when no observer is given, so that it can emit
+    its events without checking for an observer first."""
+
+    def on_candidates_found(self, lrp: LocationReferencePoint, candidates: Sequence[Candidate]):
+        pass
+
+    def on_route_fail(self, from_lrp: LocationReferencePoint, to_lrp: LocationReferencePoint,
+                      from_line: Line, to_line: Line):
+        pass
+
+    def on_route_success(self, from_lrp: LocationReferencePoint, to_lrp: LocationReferencePoint,
+                         from_line: Line, to_line: Line, path: Sequence[Line]):
+        pass
+
+    def on_matching_fail(self, from_lrp: LocationReferencePoint, to_lrp: LocationReferencePoint,
+                         from_candidates: Sequence[Candidate], to_candidates: Sequence[Candidate]):
+        pass
+
+
+#: The observer instance used by the decoder when the caller does not provide one
+NULL_OBSERVER = NullObserver()
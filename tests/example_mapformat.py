@@ -1,16 +1,25 @@
 """example mapformat to test"""
 import sqlite3
 import os
+import atexit
+import shutil
+import tempfile
 
 from openlr_dereferencer.example_sqlite_map import SRID
 
 INIT_SQL = f"""SELECT InitSpatialMetaData(1);
 
+BEGIN;
+
 CREATE TABLE nodes (id INTEGER PRIMARY KEY);
 SELECT AddGeometryColumn('nodes', 'coord', {SRID}, 'POINT', 2, 1);
 
 CREATE TABLE lines (startnode INT, endnode INT, frc INT, fow INT);
 SELECT AddGeometryColumn('lines', 'path', {SRID}, 'LINESTRING', 2, 1);
+CREATE INDEX lines_startnode ON lines (startnode);
+CREATE INDEX lines_endnode ON lines (endnode);
+SELECT CreateSpatialIndex('nodes', 'coord');
+SELECT CreateSpatialIndex('lines', 'path');
 
 INSERT INTO nodes (id, coord) VALUES
     (0, MakePoint(13.41, 52.525, {SRID})),
@@ -50,17 +59,39 @@ INSERT INTO lines (startnode, endnode, frc, fow, path) VALUES
     (13, 14, 3, 3, ST_GeomFromText("LINESTRING(13.429 52.523, 13.425 52.521, 13.42 52.52, 13.4123 52.52, 13.41 52.5245)", {SRID})),
     (14, 5, 1, 3, ST_GeomFromText("LINESTRING(13.41 52.5245, 13.4125 52.521, 13.4175 52.521)", {SRID})),
     (14, 13, 3, 3, ST_GeomFromText("LINESTRING(13.41 52.5245, 13.4123 52.52, 13.42 52.52, 13.425 52.521, 13.429 52.523)", {SRID}));
+
+COMMIT;
 """
 
-def setup_testdb(db_file: str):
-    "Creates a sqlite DB with all the test data"
+# Path of the DB file that setup_testdb copies, once it was created
+_TEMPLATE_DB = None
+
+def create_testdb(db_file: str):
+    "Creates a sqlite DB with all the test data by running INIT_SQL"
     conn = sqlite3.connect(db_file)
     conn.enable_load_extension(True)
     conn.load_extension('mod_spatialite')
     cur = conn.cursor()
+    # The DB is thrown away after the test run, so it does not need to survive crashes
+    cur.executescript(
+        "PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF; PRAGMA temp_store = MEMORY;"
+    )
     cur.executescript(INIT_SQL)
     conn.close()
 
+def setup_testdb(db_file: str):
+    """Creates a sqlite DB with all the test data
+
+    The test DB is only built once per process. Every call copies that template."""
+    global _TEMPLATE_DB
+    if _TEMPLATE_DB is None:
+        (handle, template) = tempfile.mkstemp(suffix=".sqlite")
+        os.close(handle)
+        atexit.register(remove_db_file, template)
+        create_testdb(template)
+        _TEMPLATE_DB = template
+    shutil.copyfile(_TEMPLATE_DB, db_file)
+
 def remove_db_file(db_file: str):
     "Removes the sqlite DB file, and does not raise when nonexistent"
     try:
@@ -1,16 +1,18 @@
 "Contains the unit tests for the decoding logic"
 import unittest
+from functools import lru_cache
 from math import degrees
-from itertools import zip_longest
-from typing import List, Iterable, TypeVar, NamedTuple
+from typing import List, Iterable, TypeVar
 from shapely.geometry import LineString
 from openlr import Coordinates, FRC, FOW, LineLocationReference, LocationReferencePoint,\
     PointAlongLineLocationReference, Orientation, SideOfRoad, PoiWithAccessPointLocationReference, \
     GeoCoordinateLocationReference
 
 from openlr_dereferencer import decode, Config
-from openlr_dereferencer.decoding import PointAlongLine, LineLocation, LRDecodeError, PoiWithAccessPoint
-from openlr_dereferencer.decoding.candidate_functions import nominate_candidates
+from openlr_dereferencer.decoding import PointAlongLine, LineLocation, LRDecodeError, PoiWithAccessPoint, \
+    decode_line
+from openlr_dereferencer.decoding.candidate_functions import nominate_candidates, \
+    candidate_search_radius
 from openlr_dereferencer.decoding.scoring import score_geolocation, score_frc, \
     score_bearing, score_angle_difference
 from openlr_dereferencer.decoding.routes import PointOnLine, Route
@@ -36,11 +38,17 @@ class DummyNode():
         "Return the saved coordinates"
         return self.coord
 
-class DummyLine(NamedTuple):
+class DummyLine():
     "Fake Line class for unit testing"
-    line_id: int
-    start_node: DummyNode
-    end_node: DummyNode
+    __slots__ = ("line_id", "start_node", "end_node", "_coordinates", "_length", "_geometry")
+
+    def __init__(self, line_id: int, start_node: DummyNode, end_node: DummyNode):
+        self.line_id = line_id
+        self.start_node = start_node
+        self.end_node = end_node
+        self._coordinates = [start_node.coord, end_node.coord]
+        self._length = None
+        self._geometry = None
 
     def __str__(self) -> str:
         return (
@@ -50,17 +58,26 @@ class DummyLine(NamedTuple):
 
     def coordinates(self) -> List[Coordinates]:
         "Returns a list of this line's coordinates"
-        return [self.start_node.coord, self.end_node.coord]
+        return self._coordinates
 
     @property
     def length(self) -> float:
         "Return distance between star and end node"
-        return distance(self.start_node.coord, self.end_node.coord)
+        if self._length is None:
+            self._length = distance(*self._coordinates)
+        return self._length
 
     @property
     def geometry(self) -> LineString:
-        return LineString([(c.lon, c.lat) for c in self.coordinates()])
+        if self._geometry is None:
+            self._geometry = LineString(self._coordinates)
+        return self._geometry
+
+    def cumulative_lengths(self) -> List[float]:
+        "Returns the running length at both nodes"
+        return [0.0, self.length]
 
+@lru_cache(maxsize=None)
 def get_test_linelocation_1():
     "Return a prepared line location with 3 LRPs"
     # References node 0 / line 1 / lines 1, 3
@@ -77,6 +94,7 @@ def get_test_linelocation_1():
     return LineLocationReference([lrp1, lrp2, lrp3], 0.0, 0.0)
 
 
+@lru_cache(maxsize=None)
 def get_test_linelocation_2():
     "Return a undecodable line location with 2 LRPs"
     # References node 0 / line 1 / lines 1, 3
@@ -89,6 +107,7 @@ def get_test_linelocation_2():
     return LineLocationReference([lrp1, lrp2], 0.0, 0.0)
 
 
+@lru_cache(maxsize=None)
 def get_test_linelocation_3():
     """Returns a line location that is within a line.
     
@@ -102,6 +121,7 @@ def get_test_linelocation_3():
                                   FOW.SINGLE_CARRIAGEWAY, -90.0, None, None)
     return LineLocationReference([lrp1, lrp2], 0.0, 0.0)
 
+@lru_cache(maxsize=None)
 def get_test_linelocation_4() -> LineLocationReference:
     "Test backtracking with a location that tries the decoder to get lost"
     # Seems to reference line 19 -> Decoder gets lost
@@ -113,6 +133,7 @@ def get_test_linelocation_4() -> LineLocationReference:
     return LineLocationReference([lrp1, lrp2, lrp3], 0.0, 0.0)
 
 
+@lru_cache(maxsize=None)
 def get_test_pointalongline() -> PointAlongLineLocationReference:
     "Get a test Point Along Line location reference"
     path_ref = get_test_linelocation_1().points[-2:]
@@ -120,6 +141,7 @@ def get_test_pointalongline() -> PointAlongLineLocationReference:
                                   SideOfRoad.RIGHT)
 
 
+@lru_cache(maxsize=None)
 def get_test_invalid_pointalongline() -> PointAlongLineLocationReference:
     "Get a test Point Along Line location reference"
     path_ref = get_test_linelocation_1().points[-2:]
@@ -127,6 +149,7 @@ def get_test_invalid_pointalongline() -> PointAlongLineLocationReference:
                                   SideOfRoad.RIGHT)
 
 
+@lru_cache(maxsize=None)
 def get_test_poi() -> PoiWithAccessPointLocationReference:
     "Get a test POI with access point location reference"
     path_ref = get_test_linelocation_1().points[-2:]
@@ -146,22 +169,24 @@ class DecodingTests(unittest.TestCase):
 
         This means, that two floats of the same index in `a` and `b` should not have a greater
         difference than `delta`."""
-        # Get the generators
-        gen_a = iter(iter_a)
-        gen_b = iter(iter_b)
-        for (a, b) in zip_longest(gen_a, gen_b):
+        list_a = list(iter_a)
+        list_b = list(iter_b)
+        if len(list_a) != len(list_b):
+            raise self.failureException(
+                f"Iterables differ in length: {len(list_a)} != {len(list_b)}.\n"
+                f"a: {list_a}\nb: {list_b}"
+            )
+        for (index, (a, b)) in enumerate(zip(list_a, list_b)):
             if abs(a - b) > delta:
-                list_a = [a] + list(gen_a)
-                list_b = [b] + list(gen_b)
                 msg = (f"Iterables are not almost equal within delta {delta}.\n"
-                       f"Remaining a: {list_a}\nRemaining b: {list_b}")
+                       f"Remaining a: {list_a[index:]}\nRemaining b: {list_b[index:]}")
                 raise self.failureException(msg)
 
     def setUp(self):
         remove_db_file(self.db)
         setup_testdb(self.db)
         self.reader = ExampleMapReader(self.db)
-        self.config = Config()
+        self.config = DEFAULT_CONFIG
 
     def test_geoscore_1(self):
         "Test scoring an excactly matching LRP candidate line"
@@ -303,6 +328,12 @@ class DecodingTests(unittest.TestCase):
             self.assertAlmostEqual(a.lon, b.lon, delta=0.00001)
             self.assertAlmostEqual(a.lat, b.lat, delta=0.00001)
 
+    def test_decode_line_without_observer(self):
+        "Decode a line location with decode_line, passing None as observer"
+        reference = get_test_linelocation_1()
+        location = decode_line(reference, self.reader, self.config, None)
+        self.assertListEqual([1, 3, 4], [l.line_id for l in location.lines])
+
     def test_decode_nopath(self):
         "Decode a line location where no short-enough path exists"
         reference = get_test_linelocation_2()
@@ -417,6 +448,19 @@ class DecodingTests(unittest.TestCase):
         self.assertListEqual([20], lines)
         self.assertGreater(len(observer.failed_matches), 0)
 
+    def test_backtracking_nominates_once(self):
+        "Candidates for an LRP are searched only once, even when backtracking"
+        myconfig = Config(search_radius=5, max_dnp_deviation=0.02)
+        reference = get_test_linelocation_4()
+        searched = []
+        find_lines_close_to = self.reader.find_lines_close_to
+        def counting_find_lines_close_to(coord, dist):
+            searched.append(coord)
+            return find_lines_close_to(coord, dist)
+        self.reader.find_lines_close_to = counting_find_lines_close_to
+        decode(reference, self.reader, config=myconfig)
+        self.assertEqual(len(searched), len(reference.points))
+
     def tearDown(self):
         self.reader.connection.close()
         remove_db_file(self.db)
@@ -431,6 +475,18 @@ class DecodingToolsTests(unittest.TestCase):
         self.assertDictEqual(config.tolerated_lfrc, DEFAULT_CONFIG.tolerated_lfrc)
         self.assertEqual(config.bear_dist, DEFAULT_CONFIG.bear_dist)
 
+    def test_candidate_search_radius(self):
+        "Shrink the candidate search radius only when a high min_score requires it"
+        lrp = LocationReferencePoint(13.41, 52.525, FRC.FRC0, FOW.SINGLE_CARRIAGEWAY, 90.0,
+                                     FRC.FRC2, 100.0)
+        config = Config(search_radius=100.0)
+        self.assertEqual(candidate_search_radius(lrp, config), 100.0)
+        config = Config(search_radius=100.0, min_score=0.8)
+        # The other scores add up to at most 0.75, so the geo score must be 0.2 or more
+        self.assertAlmostEqual(candidate_search_radius(lrp, config), 80.8)
+        config = Config(search_radius=100.0, min_score=1.1)
+        self.assertEqual(candidate_search_radius(lrp, config), 0.0)
+
     def test_remove_offsets(self):
         "Remove offsets containing lines"
         node0 = DummyNode(Coordinates(13.128987, 52.494595))
@@ -7,7 +7,7 @@ import unittest
 from openlr import Coordinates
 
 from openlr_dereferencer.example_sqlite_map import (
-    ExampleMapReader, Line, ExampleMapError, Node
+    ExampleMapReader, Line, ExampleMapError, Node, SRID
 )
 
 from .example_mapformat import setup_testdb, remove_db_file
@@ -54,6 +54,48 @@ class SQLiteMapTest(unittest.TestCase):
             in self.reader.find_nodes_close_to(Coordinates(13.411, 52.525), 100)]
         self.assertSequenceEqual(nodes, [0, 14])
 
+    def test_nearest_without_spatial_index(self):
+        "Test if searching without the spatial indexes finds the same nodes and lines"
+        coord = Coordinates(13.411, 52.525)
+        lines = sorted(line.line_id for line in self.reader.find_lines_close_to(coord, 300))
+        self.reader.connection.execute("SELECT DisableSpatialIndex('nodes', 'coord')")
+        self.reader.connection.execute("SELECT DisableSpatialIndex('lines', 'path')")
+        self.reader.connection.commit()
+        self.reader.connection.close()
+        self.reader = ExampleMapReader(self.db)
+        nodes = [node.node_id for node in self.reader.find_nodes_close_to(coord, 100)]
+        self.assertSequenceEqual(nodes, [0, 14])
+        self.assertSequenceEqual(
+            sorted(line.line_id for line in self.reader.find_lines_close_to(coord, 300)), lines
+        )
+
+    def test_nearest_across_antimeridian(self):
+        "Test if searching with and without the spatial indexes agree across the antimeridian"
+        self.reader.connection.executescript(f"""
+            INSERT INTO nodes (id, coord) VALUES
+                (15, MakePoint(179.999, 0.0, {SRID})),
+                (16, MakePoint(-179.999, 0.0, {SRID})),
+                (17, MakePoint(-179.998, 0.0, {SRID}));
+            INSERT INTO lines (startnode, endnode, frc, fow, path) VALUES
+                (16, 17, 2, 3, ST_GeomFromText("LINESTRING(-179.999 0, -179.998 0)", {SRID}));
+        """)
+        coord = Coordinates(179.9995, 0.0)
+        nodes = sorted(node.node_id for node in self.reader.find_nodes_close_to(coord, 500))
+        lines = sorted(line.line_id for line in self.reader.find_lines_close_to(coord, 500))
+        self.assertSequenceEqual(nodes, [15, 16, 17])
+        self.assertSequenceEqual(lines, [21])
+        self.reader.connection.execute("SELECT DisableSpatialIndex('nodes', 'coord')")
+        self.reader.connection.execute("SELECT DisableSpatialIndex('lines', 'path')")
+        self.reader.connection.commit()
+        self.reader.connection.close()
+        self.reader = ExampleMapReader(self.db)
+        self.assertSequenceEqual(
+            sorted(node.node_id for node in self.reader.find_nodes_close_to(coord, 500)), nodes
+        )
+        self.assertSequenceEqual(
+            sorted(line.line_id for line in self.reader.find_lines_close_to(coord, 500)), lines
+        )
+
     def test_line_coords(self):
         "Test known line coordinates()"
         path = self.reader.get_line(1).coordinates()
@@ -61,6 +103,14 @@ class SQLiteMapTest(unittest.TestCase):
             list(path), [Coordinates(13.41, 52.525), Coordinates(13.414, 52.525)]
         )
 
+    def test_line_point_n(self):
+        "Test if point_n matches the line geometry, counting from 1"
+        line = self.reader.get_line(18)
+        self.assertEqual(line.point_n(1), Coordinates(13.429, 52.523))
+        self.assertEqual(line.point_n(5), Coordinates(13.41, 52.5245))
+        with self.assertRaises(Exception):
+            line.point_n(6)
+
     def test_line_distance(self):
         "Test if a point on a line has zero distance from it"
         line = self.reader.get_line(1)
@@ -77,6 +127,14 @@ class SQLiteMapTest(unittest.TestCase):
         "Get a test line"
         _line = self.reader.get_line(17)
 
+    def test_get_line_cached(self):
+        "Check that repeated lookups of a line or node return the same object"
+        line = self.reader.get_line(17)
+        self.assertIs(line, self.reader.get_line(17))
+        self.assertIs(line.start_node, self.reader.get_node(line.start_node.node_id))
+        self.reader.clear_cache()
+        self.assertIsNot(line, self.reader.get_line(17))
+
     def test_node_invalid_id_type(self):
         "Check if an invalid node id raises an error"
         with self.assertRaises(ExampleMapError):
@@ -87,6 +145,12 @@ class SQLiteMapTest(unittest.TestCase):
         with self.assertRaises(TypeError):
             _ = Node(self.reader, 15).coordinates
 
+    def test_node_coordinates(self):
+        "Test known node coordinates, read once per node"
+        node = self.reader.get_node(3)
+        self.assertEqual(node.coordinates, Coordinates(13.4145, 52.529))
+        self.assertIs(node.coordinates, node.coordinates)
+
     def test_node_enumeration(self):
         "Test if a sorted list of point IDs is as expected"
         nodes = []
@@ -7,7 +7,8 @@ from shapely.geometry import Point, LineString
 
 from openlr import Coordinates
 
-from openlr_dereferencer.maps.wgs84 import extrapolate, distance, interpolate, bearing, split_line
+from openlr_dereferencer.maps.wgs84 import extrapolate, distance, interpolate, bearing, split_line, \
+    join_coordinates
 
 class GeoTests(unittest.TestCase):
     "Unit tests for all the WGS84 functions"
@@ -115,3 +116,11 @@ class GeoTests(unittest.TestCase):
         (first, second) = split_line(line, 0.5 * length)
         self.assertAlmostEqual(first.length + second.length, line.length)
 
+    def test_join_coordinates(self):
+        start = Coordinates(13.0, 52.0)
+        middle = Coordinates(13.1, 52.0)
+        end = Coordinates(13.1, 52.1)
+        line = join_coordinates([[start, middle], LineString([middle, end]).coords])
+        self.assertEqual(line, LineString([start, middle, end]))
+        with self.assertRaises(ValueError):
+            join_coordinates([[start, middle], [start, end]])